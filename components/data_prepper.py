@@ -1,12 +1,14 @@
 import os, sys, logging
+import numpy as np
 import pandas as pd
 import datetime
-from arcgis import GeoAccessor, GeoSeriesAccessor
-from arcpy import env, Geometry, ListFields, ListFeatureClasses, ListDatasets, Exists
-from arcpy.da import UpdateCursor
-from arcpy.analysis import Identity, SpatialJoin
+from functools import cached_property
+from arcpy import env, Describe, FieldMappings, SpatialReference, Geometry, ListFields, ListFeatureClasses, \
+    ListDatasets, Exists
+from arcpy.da import SearchCursor, InsertCursor, TableToNumPyArray, FeatureClassToNumPyArray, NumPyArrayToFeatureClass
 from arcpy.management import SelectLayerByLocation, SelectLayerByAttribute, MakeFeatureLayer, GetCount, FeatureToPoint, \
-    Append, AddField, DeleteField, CreateFileGDB
+    CreateFileGDB, Delete, DeleteField, JoinField, CalculateField, AddIndex
+from arcpy.analysis import SpatialJoin
 from arcpy.conversion import ExportFeatures
 
 env.overwriteOutput = True  # Need this to overwrite outputs without failing
@@ -40,89 +42,149 @@ class PrepareData:
         """Validates input parameters and ensures that they are valid before processing the data"""
         if not Exists(default_gdb):
             raise Exception(f"Parameter default_gdb: Does not exist and should exist before processing begins")
-        if not Exists(site_a_path):
-            raise Exception(
-                f"Parameter site_a_path: Must be a valid link to the data and must exist before processing begins.")
-        if not Exists(site_p_path):
-            raise Exception(
-                f"Parameter site_p_path: Must be a valid link to the data and must exist before processing begins.")
-        if not Exists(adv_pd_path):
-            raise Exception(
-                f"Parameter adv_pd_path: Must be a valid link to the data and must exist before processing begins.")
-        if not isinstance(ia_a_nme, str):
-            raise Exception("Parameter ia_a_nme: Must be of type string.")
-        if not isinstance(scratch_gdb, str):
-            raise Exception(
-                f" Parameter 'scratch_gdb' is of type {type(scratch_gdb)}. This parameter must be a string.")
-        if not isinstance(out_fc_nme, str):
-            raise Exception("Parameter out_fc_nme: Must be of type string.")
+
+        for param, path in [("site_a_path", site_a_path), ("site_p_path", site_p_path), ("adv_pd_path", adv_pd_path)]:
+            if not Exists(path):
+                raise Exception(
+                    f"Parameter {param}: Must be a valid link to the data and must exist before processing begins.")
+
+        for param, value, param_type in [("ia_a_nme", ia_a_nme, str),
+                                         ("scratch_gdb", scratch_gdb, str),
+                                         ("out_fc_nme", out_fc_nme, str),
+                                         ("pd_sid_fld_nme", pd_sid_fld_nme, str),
+                                         ("adv_sid_fld_nme", adv_sid_fld_nme, str)]:
+            if not isinstance(value, param_type):
+                raise Exception(
+                    f"Parameter {param}: Must be of type {param_type.__name__}. Currently type: {type(value)}")
         if not isinstance(sr, int):
             raise Exception(
                 f"Parameter sr: Must be an integer matching a projections WKID. Is currently type: {type(sr)}")
-        if not isinstance(pd_sid_fld_nme, str):
-            raise Exception(f"Parameter pd_sid_fld_nme must be of type string. Currently type {type(pd_sid_fld_nme)}")
-        if not isinstance(adv_sid_fld_nme, str):
-            raise Exception(f"Parameter adv_sid_fld_nme must be of type string. Currently type {type(adv_sid_fld_nme)}")
-
-    def add_site_id(self, target_lyr, site_lyr, non_ess_fields: list[str], bldp_lyr, orig_sdf, fld_nme: str,
-                    out_fld_nme: str, scratch_gdb_path: str, scratch_fc_nme='scratch',
-                    link_fld='PLACE_ID') -> GeoAccessor:
-        """Adds the site id field to the target layer from the site layer and names it according to the out field name"""
-
-        scratch_fc_path = os.path.join(scratch_gdb_path, scratch_fc_nme)
-        temp_id = "temp_id"
-
-        # Create temp ID field to prevent duplication errors
-        AddField(target_lyr, temp_id, 'LONG')
-        with UpdateCursor(target_lyr, [temp_id]) as cursor:
-            row_int = 1
-            for row in cursor:
-                row[0] = row_int
-                row_int += 1
-                cursor.updateRow(row)
-
-        # If the field(s) we're working with already exist in the dataset delete it
-        if Exists(scratch_fc_path):
-            for fld in [fld_nme, out_fld_nme]:
-                if fld in [f.name for f in ListFields(scratch_fc_path)]:
-                    self.logger.info(f"{fld} already in target layer. Deleting existing field")
-                    DeleteField(scratch_fc_path, fld_nme)
-
-        Identity(target_lyr, site_lyr, scratch_fc_path)  # Adds the fields site id field from site_a to the target layer
-        DeleteField(in_table=scratch_fc_path,
-                    drop_field=non_ess_fields,
-                    method="DELETE_FIELDS")  # Delete non essential fields from the result
-
-        # Identity explodes multiparts and parts can have diff site_ids. find part with highest point count and use the site associated with that part for that community (all parts)
-        SpatialJoin(scratch_fc_path, bldp_lyr,
-                    f"{scratch_fc_path}_2")  # Used because we jet a join_count field for the points in that polygon
-        sdf = GeoAccessor.from_featureclass(f"{scratch_fc_path}_2",
-                                            sr=self.sr)  # convert the results to a dataframe because its easier
-
-        # Keep only the parts that have the highest count if they are duplicated
-        sdf = sdf.sort_values(by='Join_Count', ascending=False).drop_duplicates(subset=temp_id, keep='first')
-
-        if fld_nme not in sdf.columns.tolist():
-            self.logger.info(fld_nme + " not in the output dataframe error")
-            self.logger.info(sdf.columns)
+
+    @cached_property
+    def bld_p_xy(self) -> pd.DataFrame:
+        """The OID and X/Y of each bld_p point. The coordinates are projected once when read and reused for the step 4
+        output. Loaded on first use (after step 1 has added any centroids) and reused after"""
+
+        xy_arr = FeatureClassToNumPyArray(self.bld_p_pth, ['OID@', 'SHAPE@X', 'SHAPE@Y'],
+                                          spatial_reference=SpatialReference(self.sr))
+        return pd.DataFrame({'BLD_P_OID': xy_arr['OID@'], 'X': xy_arr['SHAPE@X'], 'Y': xy_arr['SHAPE@Y']})
+
+    @cached_property
+    def bld_p_comm(self) -> pd.DataFrame:
+        """The bld_p point OIDs tagged with the link field of the indigenous community they fall in"""
+
+        return self.tag_bld_p(self.ia_a_pth, self.link_fld)
+
+    @cached_property
+    def site_p_ids(self) -> set:
+        """The set of SITE_ID values in site_p. Only the ids are read, not the geometry or other attributes"""
+
+        with SearchCursor(self.site_p_pth, ['SITE_ID']) as cursor:
+            return {row[0] for row in cursor}
+
+    @staticmethod
+    def downcast_ids(sdf, id_flds: list[str]) -> pd.DataFrame:
+        """Converts the id fields to nullable integers (or categories for string ids) so merges and groupbys on them
+        don't have to hash python objects one at a time"""
+
+        dtypes = {}
+        for fld in id_flds:
+            col = sdf[fld]
+            if pd.api.types.is_integer_dtype(col) or \
+                    (pd.api.types.is_float_dtype(col) and (col.dropna() % 1 == 0).all()):
+                dtypes[fld] = 'Int64'
+            elif pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col):
+                dtypes[fld] = 'category'
+        return sdf.astype(dtypes)
+
+    @staticmethod
+    def id_array(col) -> tuple:
+        """Converts an id column to a plain numpy array that can be written by arcpy. Numeric ids are written as int32
+        (LONG) when they all fit and int64 otherwise, string ids as text. Returns the array and the placeholder used for
+        nulls, which arcpy arrays can't hold"""
+
+        if pd.api.types.is_numeric_dtype(col):
+            ids = col.dropna()
+            if not (ids % 1 == 0).all():
+                raise Exception(f"Field {col.name}: Site ids must be whole numbers to be written as an integer field")
+
+            # The placeholder is the smallest value of the type, so keep it out of the range of the real ids
+            int32_info = np.iinfo(np.int32)
+            fits_int32 = ids.empty or (ids.min() > int32_info.min and ids.max() <= int32_info.max)
+            id_type = np.int32 if fits_int32 else np.int64
+            null_val = int(np.iinfo(id_type).min)
+            if not ids.empty and ids.min() <= null_val:
+                raise Exception(f"Field {col.name}: Site ids are out of range for an integer field")
+            return col.fillna(null_val).astype(id_type).to_numpy(), null_val
+        return col.astype(object).where(col.notna(), '').to_numpy(dtype=str), ''
+
+    @staticmethod
+    def set_null_ids(fc_pth, fld: str, null_val) -> None:
+        """Sets the rows of the id field that hold the null placeholder to real nulls"""
+
+        where = f"{fld} = ''" if isinstance(null_val, str) else f"{fld} = {null_val}"
+        null_lyr = MakeFeatureLayer(fc_pth, 'null_ids', where)
+        if int(GetCount(null_lyr)[0]) > 0:
+            CalculateField(null_lyr, fld, "None", "PYTHON3")
+        Delete(null_lyr)
+
+    def tag_bld_p(self, join_lyr, join_fld: str, bldp_lyr=None) -> pd.DataFrame:
+        """Spatially joins the bld_p points (or the selected points of bldp_lyr) to the polygons of the join layer they
+        fall in and returns a dataframe of the bld_p OID and the join field of the matched polygon (one row per point
+        and polygon). Points that fall in no polygon are left out"""
+
+        out_pth = os.path.join("memory", f"bld_p_{join_fld}")  # Only the OID pairs are needed so keep it in memory
+        SpatialJoin(bldp_lyr or self.bld_p_pth, join_lyr, out_pth, "JOIN_ONE_TO_MANY", "KEEP_COMMON",
+                    field_mapping=FieldMappings(), match_option=self.spatial_relationship)
+        fid_arr = TableToNumPyArray(out_pth, ['TARGET_FID', 'JOIN_FID'])
+        Delete(out_pth)
+
+        # The join layers are small next to bld_p so read their ids with a cursor (handles null ids)
+        with SearchCursor(join_lyr, ['OID@', join_fld]) as cursor:
+            join_ids = self.downcast_ids(pd.DataFrame(list(cursor), columns=['JOIN_FID', join_fld]), [join_fld])
+
+        matches = pd.DataFrame({'BLD_P_OID': fid_arr['TARGET_FID'], 'JOIN_FID': fid_arr['JOIN_FID']})
+        matches = matches.merge(join_ids, on='JOIN_FID', how='left', validate='m:1')
+        return matches.drop(columns=['JOIN_FID'])
+
+    def add_site_id(self, site_lyr, pts_df, bldp_lyr, fld_nme: str, out_fld_nme: str,
+                    link_fld='PLACE_ID') -> pd.DataFrame:
+        """Gets the site id from the site layer for each community and names it according to the out field name.
+        pts_df is the bld_p point OIDs already tagged with the link field of the community they fall in and bldp_lyr
+        is a bld_p layer with those points selected. Returns a dataframe of the link field and the out field to be
+        merged to the communities"""
+
+        site_flds = {f.name for f in ListFields(site_lyr)}
+        if fld_nme not in site_flds:
+            self.logger.info("%s not in the site layer error", fld_nme)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Site layer fields: %s", sorted(site_flds))
             sys.exit()
 
+        # Tag each community tagged bld_p point with the site polygon it falls in (null if it falls in none)
+        pts_df = pts_df.merge(self.tag_bld_p(site_lyr, fld_nme, bldp_lyr), on='BLD_P_OID', how='left')
+
+        # Communities can span multiple sites. Count the points each site has in each community and use the site
+        # with the highest point count for that community (all parts)
+        sdf = pts_df.groupby([link_fld, fld_nme], dropna=False, observed=True).size().reset_index(name='Join_Count')
+
+        # Keep only the sites that have the highest count if they are duplicated
+        sdf = sdf.loc[sdf.groupby(link_fld, sort=False, observed=True)['Join_Count'].idxmax()]
+
         sdf.rename(columns={fld_nme: out_fld_nme}, inplace=True)
 
         if out_fld_nme not in sdf.columns.tolist():
-            self.logger.info(out_fld_nme + " not in the output dataframe error")
+            self.logger.info("%s not in the output dataframe error", out_fld_nme)
             sys.exit()
 
-        # Merge the linked site_id field to the original data
-        orig_sdf = orig_sdf.merge(sdf[[link_fld, out_fld_nme]],
-                                  on=link_fld)
-
-        return orig_sdf
+        return sdf[[link_fld, out_fld_nme]]
 
-    def check_site_id_exists(self, in_ids: list[int], site_p_sdf, site_fld='SITE_ID') -> list:
-        """Checks to see if the input site ids are in the site_p layer and returns a list of those ids if found"""
+    def check_site_id_exists(self, in_ids: pd.Series, site_ids: set) -> list:
+        """Checks to see if the input site ids are in the set of site_p ids and returns a list of those ids not found.
+        Null ids (communities with no matched site) are not site ids so they are left out"""
 
-        return [f for f in in_ids if f not in site_p_sdf[site_fld].tolist()]
+        in_ids = in_ids.dropna()
+        return in_ids[~in_ids.isin(site_ids)].tolist()
 
     def step_1(self):
         """Identify indigenous communities without points in bld_p and add one (centroid) to the layer for the purpose of this analysis"""
@@ -136,70 +198,114 @@ class PrepareData:
 
         no_points_cnt = int(GetCount(self.ia_flyr)[0])  # Count of all polygons that have no points in them
 
-        self.logger.info(f"Number of indigneous polygons with no BLDING_P points = {no_points_cnt}")
+        self.logger.info("Number of indigneous polygons with no BLDING_P points = %s", no_points_cnt)
 
         if no_points_cnt > 0:  # If the no points count is greater than 0 add the centroid of those polygons to the blding p layer
 
-            centroids_path = os.path.join(self.scratch_gdb, 'ia_centroids')  # Path to our centroids layer
+            centroids_path = os.path.join("memory", 'ia_centroids')  # Keep the intermediate centroids in memory
             FeatureToPoint(self.ia_flyr, centroids_path, "INSIDE")
 
+            # Read the centroids in the bld_p projection so they can be inserted directly
+            with SearchCursor(centroids_path, ['SHAPE@XY'],
+                              spatial_reference=Describe(self.bld_p_pth).spatialReference) as cursor:
+                centroids = [row[0] for row in cursor]
+            Delete(centroids_path)
+
             self.bld_p_nme = f"{self.bld_p_nme}_ap"
             self.bld_p_pth = os.path.join(self.scratch_gdb, self.bld_p_nme)
             ExportFeatures(self.bld_p_flyr, self.bld_p_pth)
 
-            # Append the new points to the bld_p_lyr
-            Append(inputs=[centroids_path], target=self.bld_p_pth, schema_type="NO_TEST")
+            # Insert the new points into the bld_p_lyr
+            with InsertCursor(self.bld_p_pth, ['SHAPE@XY']) as cursor:
+                for xy in centroids:
+                    cursor.insertRow([xy])
             self.bld_p_flyr = MakeFeatureLayer(self.bld_p_pth, 'bld_p')  # Update the bld_p feature layer
 
     def step_2(self):
         """Associate the pd and adv site data with the point in each polygon"""
 
-        # Add the pd fields to the indigenous layer
-        self.indig_sdf = self.add_site_id(target_lyr=self.ia_a_pth,
-                                          site_lyr=self.site_a_pth,
-                                          orig_sdf=self.indig_sdf,
-                                          non_ess_fields=self.site_a_fields,
-                                          bldp_lyr=self.bld_p_flyr,
-                                          fld_nme='PD_Site_ID',
-                                          out_fld_nme=self.pd_sid_fld_nme,
-                                          scratch_gdb_path=self.scratch_gdb)  # FOR PD SITE_ID
-
-        self.indig_sdf = self.add_site_id(target_lyr=self.ia_a_pth,
-                                          site_lyr=self.adv_pd_pth,
-                                          orig_sdf=self.indig_sdf,
-                                          non_ess_fields=self.advpd_fields,
-                                          bldp_lyr=self.bld_p_flyr,
-                                          fld_nme='ADVPD_Site_ID',
-                                          out_fld_nme=self.adv_sid_fld_nme,
-                                          scratch_gdb_path=self.scratch_gdb)  # FOR ADVPD_SITE_ID
+        # bld_p is the largest layer so it is tagged with its communities once for both site layers
+        pts_df = self.bld_p_comm
+
+        # Only the points in a community are needed for the site joins
+        SelectLayerByLocation(self.bld_p_flyr, "INTERSECT", self.ia_a_pth)
+
+        pd_site_ids = self.add_site_id(site_lyr=self.site_a_pth,
+                                       pts_df=pts_df,
+                                       bldp_lyr=self.bld_p_flyr,
+                                       fld_nme='PD_Site_ID',
+                                       out_fld_nme=self.pd_sid_fld_nme,
+                                       link_fld=self.link_fld)  # FOR PD SITE_ID
+
+        adv_site_ids = self.add_site_id(site_lyr=self.adv_pd_pth,
+                                        pts_df=pts_df,
+                                        bldp_lyr=self.bld_p_flyr,
+                                        fld_nme='ADVPD_Site_ID',
+                                        out_fld_nme=self.adv_sid_fld_nme,
+                                        link_fld=self.link_fld)  # FOR ADVPD_SITE_ID
+
+        SelectLayerByAttribute(self.bld_p_flyr, "CLEAR_SELECTION")
+
+        site_ids = pd_site_ids.merge(adv_site_ids, on=self.link_fld, how='outer', validate='1:1')
+
+        # Add the pd and adv fields to the indigenous layer. Validate so that a community matched to more than one
+        # site can't duplicate rows in the indigenous layer
+        self.indig_df = self.indig_df.merge(site_ids, on=self.link_fld, how='left', validate='m:1')
 
     def step_3(self):
         """Test to see if the matched id fields are in the pd layer and note any that are not present"""
 
-        pd_site_id = self.indig_sdf[self.pd_sid_fld_nme].to_list()
-        adv_site_id = self.indig_sdf[self.adv_sid_fld_nme].to_list()
+        pd_site_id = self.indig_df[self.pd_sid_fld_nme]
+        adv_site_id = self.indig_df[self.adv_sid_fld_nme]
 
-        site_p_sdf = GeoAccessor.from_featureclass(self.site_p_pth)
+        pd_missing = self.check_site_id_exists(pd_site_id, self.site_p_ids)
+        adv_missing = self.check_site_id_exists(adv_site_id, self.site_p_ids)
 
-        pd_missing = self.check_site_id_exists(pd_site_id, site_p_sdf)
-        adv_missing = self.check_site_id_exists(adv_site_id, site_p_sdf)
+        self.logger.info("Indigenous communities with no matched site (count): PDs: %s, ADVs:%s",
+                         pd_site_id.isna().sum(), adv_site_id.isna().sum())
 
-        self.logger.info(f"Site_P points missing from matched site_ids (count): PDs: {len(pd_missing)}, ADVs:{len(adv_missing)}")
+        self.logger.info("Site_P points missing from matched site_ids (count): PDs: %s, ADVs:%s", len(pd_missing),
+                         len(adv_missing))
         if len(pd_missing) > 0:
-            self.logger.info(f"Missing PD site_ids: {pd_missing}")
+            self.logger.info("Missing PD site_ids: %s", pd_missing)
         if len(adv_missing) > 0:
-            self.logger.info(f"Missing ADV site_ids: {adv_missing}")
+            self.logger.info("Missing ADV site_ids: %s", adv_missing)
 
     def step_4(self):
         """Join the site_id's from the indigenous layers to the building_p layer"""
-        bld_p_sdf = GeoAccessor.from_featureclass(self.bld_p_pth, sr=self.sr)
-
-        # Perform the spatial join
-        bld_p_sdf_joined = bld_p_sdf.spatial.join(self.indig_sdf[[self.adv_sid_fld_nme, self.pd_sid_fld_nme, "SHAPE"]],
-                                                  op=self.spatial_relationship)
-        bld_p_sdf_joined.drop(columns=['index_right'], inplace=True)
-
-        bld_p_sdf_joined.spatial.to_featureclass(os.path.join(self.default_gdb, self.out_fc_nme), overwrite=True)
+        # The bld_p points were already tagged with their community in step 2 so the site ids can be joined on the
+        # link field without another spatial join. Each link has one set of site ids from step 2
+        site_ids = self.indig_df[[self.link_fld, self.pd_sid_fld_nme, self.adv_sid_fld_nme]].drop_duplicates(
+            subset=self.link_fld)
+        bld_p_joined = self.bld_p_comm.merge(site_ids, on=self.link_fld, validate='m:1')
+        bld_p_joined = bld_p_joined.merge(self.bld_p_xy, on='BLD_P_OID', validate='m:1')
+
+        # Bulk write the points with their site ids
+        pd_ids, pd_null = self.id_array(bld_p_joined[self.pd_sid_fld_nme])
+        adv_ids, adv_null = self.id_array(bld_p_joined[self.adv_sid_fld_nme])
+        out_arr = np.rec.fromarrays([bld_p_joined['X'].to_numpy(),
+                                     bld_p_joined['Y'].to_numpy(),
+                                     bld_p_joined['BLD_P_OID'].to_numpy(),
+                                     pd_ids,
+                                     adv_ids],
+                                    names=['X', 'Y', 'BLD_P_OID', self.pd_sid_fld_nme, self.adv_sid_fld_nme])
+
+        out_fc_pth = os.path.join(self.default_gdb, self.out_fc_nme)
+        if Exists(out_fc_pth):
+            Delete(out_fc_pth)
+        NumPyArrayToFeatureClass(out_arr, out_fc_pth, ('X', 'Y'), SpatialReference(self.sr))
+        self.set_null_ids(out_fc_pth, self.pd_sid_fld_nme, pd_null)
+        self.set_null_ids(out_fc_pth, self.adv_sid_fld_nme, adv_null)
+
+        # Carry the bld_p attributes over to the output. BLD_P_OID is the OID in the bld_p used for this run, which is
+        # the copy in the scratch gdb when step 1 added centroids, so the join has to use that same layer. Index the
+        # input join field first as recommended for JoinField (the bld_p OID is already indexed)
+        AddIndex(out_fc_pth, ['BLD_P_OID'], 'BLD_P_OID_IDX')
+        JoinField(out_fc_pth, 'BLD_P_OID', self.bld_p_pth, Describe(self.bld_p_pth).OIDFieldName)
+
+        # X/Y were only needed to build the points and BLD_P_OID only for the join (it means nothing outside this run)
+        tmp_flds = [f.name for f in ListFields(out_fc_pth) if f.name in ('X', 'Y', 'BLD_P_OID')]
+        DeleteField(out_fc_pth, tmp_flds)
 
     def __init__(self, default_gdb: str, scratch_gdb: str, site_a_path: str, adv_pd_path: str, site_p_path: str,
                  ia_a_nme="INDIG_AUTOCH_A", bld_p_nme="BUILDING_P", out_fc_nme="bld_p_processed", sr=4326,
@@ -218,7 +324,8 @@ class PrepareData:
         # Set other parameters
         self.ia_a_nme = ia_a_nme  # Name of the IND_AUT_A layer
         self.bld_p_nme = bld_p_nme  # Name of the building p layer
-        self.spatial_relationship = 'intersects'
+        self.spatial_relationship = 'INTERSECT'  # Match option for the bld_p spatial joins
+        self.link_fld = 'PLACE_ID'  # Field that links the indigenous communities across steps
 
         self.pd_sid_fld_nme = pd_sid_fld_nme
         self.adv_sid_fld_nme = adv_sid_fld_nme
@@ -233,15 +340,10 @@ class PrepareData:
         self.sr = sr
         self.ia_a_pth = os.path.join(self.default_gdb, f"{self.ia_a_nme}")
         self.bld_p_pth = os.path.join(self.default_gdb, f"{self.bld_p_nme}")
-        self.indig_sdf = GeoAccessor.from_featureclass(self.ia_a_pth, sr=self.sr)
-
-        # Get a list of all site a fields to drop exclude essential fields (cannot be deleted) and the field we want to keep (SITE_ID)
-        self.site_a_fields = [f.name for f in ListFields(self.site_a_pth) if
-                              f.name not in ["SHAPE.AREA", "SHAPE.LEN", "SITE_ID", "OBJECTID", 'Shape', 'SHAPE',
-                                             'Shape_Area', 'Shape_Length']]
-        self.advpd_fields = [f.name for f in ListFields(self.site_a_pth) if
-                             f.name not in ["SHAPE.AREA", "SHAPE.LEN", "SITE_ID", "OBJECTID", 'Shape', 'SHAPE',
-                                            'Shape_Area', 'Shape_Length']]
+        # Only the link field is used downstream so read it without the geometry
+        with SearchCursor(self.ia_a_pth, [self.link_fld]) as cursor:
+            self.indig_df = self.downcast_ids(pd.DataFrame([row for row in cursor], columns=[self.link_fld]),
+                                              [self.link_fld])
 
         # Make the key layers into feature layers
         self.ia_flyr = MakeFeatureLayer(self.ia_a_pth, "ia_a")